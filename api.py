@@ -4,25 +4,50 @@ API REST para converter PDF para Word usando o site iLovePDF.
 Fornece endpoints para upload, status e download do arquivo convertido.
 """
 
+from __future__ import annotations
+
 import os
 import uuid
+import asyncio
+import logging
+import shutil
+import hashlib
 import time
+import queue
 import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+import anyio
+from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Request
+from fastapi.responses import FileResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+# Selenium e webdriver-manager são importados só onde são usados,
+# para não pesar no import de processos que não fazem conversões
+if TYPE_CHECKING:
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+
+try:
+    # inotify só existe no Linux; nos demais sistemas usa polling
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
+try:
+    # Opcionais: dividir PDFs grandes e juntar os .docx resultantes
+    from pypdf import PdfReader, PdfWriter
+    from docx import Document
+    from docxcompose.composer import Composer
+except ImportError:
+    PdfReader = None
 
 
 # ============ Configuração ============
@@ -31,10 +56,74 @@ OUTPUT_DIR = Path("./outputs")
 UPLOAD_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+# Número de navegadores Chrome mantidos abertos (conversões simultâneas)
+MAX_CONCURRENT_CONVERSIONS = 2
+
+# Tamanho dos blocos usados para gravar uploads em disco (64 KB)
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Conversões extras aceitas na fila; além disso a API responde 503
+MAX_QUEUED_CONVERSIONS = MAX_CONCURRENT_CONVERSIONS
+
+# Quantas vezes uma conversão é tentada antes de ser marcada como erro
+MAX_CONVERSION_ATTEMPTS = 3
+
+# PDFs com mais páginas que isso são divididos e convertidos em paralelo
+SPLIT_THRESHOLD_PAGES = 50
+
+# Tempo (em segundos) que uma conversão concluída e seu arquivo ficam disponíveis
+CONVERSION_TTL = 24 * 60 * 60
+
+# Por quanto tempo o cliente pode reutilizar o arquivo baixado sem revalidar
+DOWNLOAD_MAX_AGE = 60 * 60
+
+# Quantos resultados recentes são lembrados para reaproveitar PDFs repetidos
+CONVERSION_CACHE_SIZE = 256
+
+# Chave pública da API oficial do iLovePDF (developer.ilovepdf.com). Se definida,
+# as conversões usam a API REST diretamente, sem Chrome/Selenium
+ILOVEPDF_PUBLIC_KEY = os.getenv("ILOVEPDF_PUBLIC_KEY")
+ILOVEPDF_API_URL = "https://api.ilovepdf.com"
+ILOVEPDF_API_TOOL = "pdfoffice"
+
+# Conversões simultâneas quando a API REST é usada (não há navegadores a limitar)
+MAX_CONCURRENT_API_CONVERSIONS = 32
+
+# Logs são enfileirados e escritos por uma thread própria (QueueListener),
+# para que as conversões nunca fiquem bloqueadas escrevendo no stdout
+log_queue: queue.Queue = queue.Queue(-1)
+logger = logging.getLogger("apipdf")
+logger.setLevel(logging.INFO)
+logger.addHandler(QueueHandler(log_queue))
+logger.propagate = False
+
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+log_listener = QueueListener(log_queue, _log_handler)
+
 # Armazena o status das conversões
 # Em produção, use Redis ou banco de dados
 conversions: dict = {}
 
+# Hash do PDF -> ID da conversão concluída (LRU)
+conversion_cache: OrderedDict = OrderedDict()
+conversion_cache_lock = threading.Lock()
+
+# Caminho do ChromeDriver, resolvido uma única vez pelo webdriver-manager
+_chromedriver_path: Optional[str] = None
+_chromedriver_lock = threading.Lock()
+
+
+def get_chromedriver_path() -> str:
+    """Retorna o caminho do ChromeDriver, instalando-o apenas na primeira chamada."""
+    global _chromedriver_path
+    if _chromedriver_path is None:
+        with _chromedriver_lock:
+            if _chromedriver_path is None:
+                from webdriver_manager.chrome import ChromeDriverManager
+                _chromedriver_path = ChromeDriverManager().install()
+    return _chromedriver_path
+
 
 # ============ Modelos ============
 class ConversionStatus(BaseModel):
@@ -46,10 +135,48 @@ class ConversionStatus(BaseModel):
 
 
 # ============ API ============
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepara o cliente da API ou o pool de navegadores antes de aceitar requisições."""
+    global api_client, driver_pool, conversion_executor
+    log_listener.start()
+    try:
+        if ILOVEPDF_PUBLIC_KEY:
+            # API REST oficial: nenhum navegador é necessário
+            api_client = ILovePDFAPIClient(ILOVEPDF_PUBLIC_KEY)
+            try:
+                yield
+            finally:
+                # Cancela as conversões em andamento antes de fechar o cliente HTTP
+                for task in list(api_tasks):
+                    task.cancel()
+                await asyncio.gather(*api_tasks, return_exceptions=True)
+                await api_client.aclose()
+            return
+        
+        get_chromedriver_path()
+        driver_pool = ChromeDriverPool(
+            size=MAX_CONCURRENT_CONVERSIONS,
+            download_dir=str(OUTPUT_DIR.absolute())
+        )
+        conversion_executor = ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENT_CONVERSIONS,
+            thread_name_prefix="conversion"
+        )
+        try:
+            yield
+        finally:
+            conversion_executor.shutdown(wait=True, cancel_futures=True)
+            driver_pool.close()
+    finally:
+        log_listener.stop()
+
+
 app = FastAPI(
     title="iLovePDF Converter API",
     description="API para converter PDF para Word usando iLovePDF",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS - permite requisições de qualquer origem
@@ -62,79 +189,301 @@ app.add_middleware(
 )
 
 
+# ============ Pool de Drivers ============
+def create_chrome_driver(download_dir: str) -> webdriver.Chrome:
+    """Cria e configura uma instância do WebDriver do Chrome."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    
+    chrome_options = Options()
+    
+    prefs = {
+        "download.default_directory": download_dir,
+        "download.prompt_for_download": False,
+        "download.directory_upgrade": True,
+        "safebrowsing.enabled": True,
+        "plugins.always_open_pdf_externally": True,
+        # Imagens não são necessárias para a automação
+        "profile.managed_default_content_settings.images": 2
+    }
+    chrome_options.add_experimental_option("prefs", prefs)
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option("useAutomationExtension", False)
+    
+    # Modo headless NOVO para Chrome 109+
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1024,768")
+    chrome_options.add_argument("--force-device-scale-factor=1")
+    chrome_options.add_argument("--disable-notifications")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    
+    # Desliga recursos que só custam tempo em modo headless
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_argument("--disable-background-networking")
+    chrome_options.add_argument("--disable-background-timer-throttling")
+    chrome_options.add_argument("--disable-renderer-backgrounding")
+    chrome_options.add_argument("--disable-features=TranslateUI,BlinkGenPropertyTrees")
+    chrome_options.add_argument("--disable-sync")
+    chrome_options.add_argument("--no-first-run")
+    chrome_options.add_argument("--disable-default-apps")
+    chrome_options.add_argument("--mute-audio")
+    
+    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/144.0.0.0 Safari/537.36")
+    
+    # Usa o ChromeDriver já resolvido pelo webdriver-manager
+    service = Service(get_chromedriver_path())
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    
+    # Configuração extra para download em headless
+    driver.execute_cdp_cmd("Browser.setDownloadBehavior", {
+        "behavior": "allow",
+        "downloadPath": download_dir
+    })
+    return driver
+
+
+def to_cdp_cookie(cookie: dict) -> dict:
+    """Converte um cookie do Selenium para o formato do Network.setCookies (CDP)."""
+    cdp_cookie = {
+        key: cookie[key]
+        for key in ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite")
+        if key in cookie
+    }
+    if "expiry" in cookie:
+        cdp_cookie["expires"] = cookie["expiry"]
+    return cdp_cookie
+
+
+class ChromeDriverPool:
+    """
+    Pool limitado de navegadores Chrome reutilizados entre conversões.
+    
+    Cada navegador fica parado na página de conversão, com os cookies já
+    aceitos, pronto para receber o próximo arquivo.
+    """
+    
+    def __init__(self, size: int, download_dir: str):
+        self.download_dir = download_dir
+        self._drivers: queue.Queue = queue.Queue(maxsize=size)
+        # Cookies gravados ao aceitar o banner, reaproveitados nos novos navegadores
+        self._consent_cookies: List[dict] = []
+        # Recarrega o formulário após cada conversão, fora do caminho crítico
+        self._parker = ThreadPoolExecutor(max_workers=size, thread_name_prefix="park")
+        for _ in range(size):
+            self._drivers.put(self._create_driver())
+    
+    def _create_driver(self) -> webdriver.Chrome:
+        """Cria um navegador já posicionado na página de conversão."""
+        driver = create_chrome_driver(self.download_dir)
+        
+        try:
+            if self._consent_cookies:
+                # Consentimento pré-semeado: o banner de cookies nem chega a aparecer
+                driver.execute_cdp_cmd("Network.setCookies", {"cookies": self._consent_cookies})
+            self._park(driver)
+            if not self._consent_cookies:
+                # Primeiro navegador: aguarda o banner e captura o consentimento
+                self._accept_cookies(driver)
+        except Exception:
+            # Não deixa um processo Chrome órfão para trás
+            try:
+                driver.quit()
+            except:
+                pass
+            raise
+        return driver
+    
+    def _park(self, driver: webdriver.Chrome):
+        """Abre uma cópia nova do formulário de conversão no navegador."""
+        from selenium.webdriver.common.by import By
+        
+        driver.get(ILovePDFConverter.URL_PDF_TO_WORD)
+        
+        # Verificação sem espera: se os cookies semeados expiraram ou não
+        # bastaram, o banner reaparece e bloquearia o botão de converter
+        if any(btn.is_displayed() for btn in driver.find_elements(By.ID, "c-p-bn")):
+            self._accept_cookies(driver)
+    
+    def _accept_cookies(self, driver: webdriver.Chrome):
+        """Fecha o banner de cookies e guarda os cookies de consentimento criados."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
+        # Compara nome e valor: o clique pode apenas atualizar um cookie já semeado
+        before = {(cookie["name"], cookie["value"]) for cookie in driver.get_cookies()}
+        try:
+            cookie_btn = WebDriverWait(driver, 5).until(
+                EC.element_to_be_clickable((By.ID, "c-p-bn"))
+            )
+            cookie_btn.click()
+            logger.info("Cookies aceitos")
+            
+            WebDriverWait(driver, 5).until(
+                lambda d: any(
+                    (cookie["name"], cookie["value"]) not in before
+                    for cookie in d.get_cookies()
+                )
+            )
+            self._consent_cookies = [
+                to_cdp_cookie(cookie) for cookie in driver.get_cookies()
+                if (cookie["name"], cookie["value"]) not in before
+            ]
+        except:
+            pass
+    
+    def _replace(self, driver: webdriver.Chrome, reason: Exception) -> Optional[webdriver.Chrome]:
+        """
+        Descarta um navegador com problema e tenta criar outro no lugar.
+        
+        Se a criação falhar, retorna None: a vaga continua no pool e o
+        navegador é recriado no próximo acquire().
+        """
+        logger.warning("Driver descartado: %s", reason)
+        try:
+            driver.quit()
+        except:
+            pass
+        
+        try:
+            return self._create_driver()
+        except Exception as e:
+            logger.error("Falha ao recriar o driver: %s", e)
+            return None
+    
+    def acquire(self) -> webdriver.Chrome:
+        """Retira um navegador pronto do pool, aguardando se todos estiverem em uso."""
+        driver = self._drivers.get()
+        
+        # Vaga vazia (recriação anterior falhou): tenta criar o navegador agora
+        if driver is None:
+            try:
+                return self._create_driver()
+            except Exception:
+                # Devolve a vaga para não encolher o pool
+                self._drivers.put(None)
+                raise
+        
+        # Verifica se a sessão continua viva e na página de conversão
+        try:
+            if not driver.current_url.startswith(ILovePDFConverter.URL_PDF_TO_WORD):
+                self._park(driver)
+        except Exception as e:
+            driver = self._replace(driver, e)
+            if driver is None:
+                self._drivers.put(None)
+                raise RuntimeError("Não foi possível iniciar o navegador") from e
+        return driver
+    
+    def release(self, driver: webdriver.Chrome):
+        """
+        Devolve o navegador ao pool sem bloquear quem o usou.
+        
+        A recarga da página de conversão roda em segundo plano, para que a
+        conversão que acabou de terminar seja concluída imediatamente.
+        """
+        self._parker.submit(self._reset, driver)
+    
+    def _reset(self, driver: webdriver.Chrome):
+        """Prepara o navegador para a próxima conversão e o devolve ao pool."""
+        try:
+            self._park(driver)
+        except Exception as e:
+            driver = self._replace(driver, e)
+        # Mesmo sem navegador (None), a vaga sempre volta para o pool
+        self._drivers.put(driver)
+    
+    def close(self):
+        """Encerra todos os navegadores ociosos do pool."""
+        self._parker.shutdown(wait=True)
+        while True:
+            try:
+                driver = self._drivers.get_nowait()
+            except queue.Empty:
+                break
+            if driver is None:
+                continue
+            try:
+                driver.quit()
+            except:
+                pass
+
+
+driver_pool: Optional[ChromeDriverPool] = None
+conversion_executor: Optional[ThreadPoolExecutor] = None
+
+
 # ============ Conversor ============
 class ILovePDFConverter:
     """Classe para automatizar a conversão de PDF para Word no iLovePDF."""
     
     URL_PDF_TO_WORD = "https://www.ilovepdf.com/pt/pdf_para_word"
     
-    def __init__(self, download_dir: str):
+    def __init__(self, driver: webdriver.Chrome, download_dir: str):
+        self.driver = driver
         self.download_dir = download_dir
-        self.driver = None
-    
-    def _setup_driver(self):
-        """Configura o WebDriver do Chrome."""
-        chrome_options = Options()
-        
-        prefs = {
-            "download.default_directory": self.download_dir,
-            "download.prompt_for_download": False,
-            "download.directory_upgrade": True,
-            "safebrowsing.enabled": True,
-            "plugins.always_open_pdf_externally": True
-        }
-        chrome_options.add_experimental_option("prefs", prefs)
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option("useAutomationExtension", False)
-        
-        # Modo headless NOVO para Chrome 109+
-        chrome_options.add_argument("--headless=new")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--disable-notifications")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/144.0.0.0 Safari/537.36")
-        
-        # Usa webdriver-manager para pegar a versão correta
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.implicitly_wait(10)
-        
-        # Configuração extra para download em headless
-        self.driver.execute_cdp_cmd("Page.setDownloadBehavior", {
-            "behavior": "allow",
-            "downloadPath": self.download_dir
-        })
     
     def _wait_for_element(self, by: By, value: str, timeout: int = 30):
         """Aguarda um elemento estar presente e visível."""
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
         wait = WebDriverWait(self.driver, timeout)
         return wait.until(EC.element_to_be_clickable((by, value)))
     
+    def _find_download(self) -> Optional[str]:
+        """Retorna o .docx baixado, se o download já terminou."""
+        files = os.listdir(self.download_dir)
+        
+        # Arquivos .crdownload indicam download em progresso
+        if any(f.endswith('.crdownload') for f in files):
+            return None
+        
+        # O diretório é exclusivo desta conversão: só pode haver um .docx
+        docx_files = [f for f in files if f.endswith('.docx')]
+        return docx_files[0] if docx_files else None
+    
     def _wait_for_download(self, timeout: int = 120) -> Optional[str]:
         """Aguarda o download ser concluído e retorna o nome do arquivo."""
+        if INotify is None:
+            return self._poll_for_download(timeout)
+        
         end_time = time.time() + timeout
         
-        while time.time() < end_time:
-            files = os.listdir(self.download_dir)
+        with INotify() as inotify:
+            inotify.add_watch(
+                self.download_dir,
+                inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO
+            )
             
-            # Verifica se há arquivos .crdownload (download em progresso)
-            downloading = any(f.endswith('.crdownload') for f in files)
+            # O download pode ter terminado antes de o watch ser criado
+            filename = self._find_download()
             
-            if not downloading:
-                # Procura por arquivos .docx
-                docx_files = [f for f in files if f.endswith('.docx')]
-                if docx_files:
-                    # Retorna o arquivo mais recente
-                    docx_files.sort(
-                        key=lambda x: os.path.getmtime(os.path.join(self.download_dir, x)),
-                        reverse=True
-                    )
-                    return docx_files[0]
+            while filename is None:
+                remaining = end_time - time.time()
+                if remaining <= 0:
+                    return None
+                
+                # Bloqueia até o kernel avisar que um arquivo foi gravado/renomeado
+                events = inotify.read(timeout=int(remaining * 1000))
+                if any(event.name.endswith('.docx') for event in events):
+                    filename = self._find_download()
             
+            return filename
+    
+    def _poll_for_download(self, timeout: int) -> Optional[str]:
+        """Aguarda o download verificando o diretório a cada segundo."""
+        end_time = time.time() + timeout
+        
+        while time.time() < end_time:
+            filename = self._find_download()
+            if filename:
+                return filename
             time.sleep(1)
         
         return None
@@ -146,42 +495,39 @@ class ILovePDFConverter:
         Returns:
             Nome do arquivo convertido ou None em caso de erro.
         """
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
         try:
-            self._setup_driver()
-            print(f"[INFO] Driver iniciado, convertendo: {pdf_path}")
-            
-            # Abre a página de conversão
-            self.driver.get(self.URL_PDF_TO_WORD)
-            print("[INFO] Página carregada")
+            # O navegador do pool já está na página de conversão
+            logger.info("Convertendo: %s", pdf_path)
             
-            # Fecha popup de cookies se existir
-            try:
-                cookie_btn = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.ID, "c-p-bn"))
-                )
-                cookie_btn.click()
-                print("[INFO] Cookies aceitos")
-            except:
-                pass
+            # Downloads desta conversão vão para o seu próprio diretório
+            # (cada navegador do pool é um processo Chrome próprio)
+            self.driver.execute_cdp_cmd("Browser.setDownloadBehavior", {
+                "behavior": "allow",
+                "downloadPath": self.download_dir
+            })
             
             # Upload do arquivo
-            file_input = self.driver.find_element(By.CSS_SELECTOR, "input[type='file']")
+            file_input = WebDriverWait(self.driver, 10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='file']"))
+            )
             file_input.send_keys(pdf_path)
-            print("[INFO] Arquivo enviado")
+            logger.info("Arquivo enviado")
             
-            # Aguarda upload completar
-            time.sleep(5)
-            
-            # Clica no botão de converter
+            # Clica no botão de converter (habilitado quando o upload termina)
             try:
                 convert_btn = self._wait_for_element(
                     By.CSS_SELECTOR, 
-                    "#processTask"
+                    "#processTask:not([disabled])",
+                    timeout=60
                 )
                 convert_btn.click()
-                print("[INFO] Botão converter clicado")
+                logger.info("Botão converter clicado")
             except Exception as e:
-                print(f"[WARN] Tentando seletor alternativo: {e}")
+                logger.warning("Tentando seletor alternativo: %s", e)
                 convert_btn = self._wait_for_element(
                     By.XPATH,
                     "//button[contains(@class, 'process')]"
@@ -189,59 +535,293 @@ class ILovePDFConverter:
                 convert_btn.click()
             
             # Aguarda botão de download
-            print("[INFO] Aguardando conversão...")
+            logger.info("Aguardando conversão...")
             download_btn = self._wait_for_element(
                 By.CSS_SELECTOR,
                 "a.downloader__btn, #downloadFile, .download__btn",
                 timeout=90
             )
-            print("[INFO] Conversão concluída, iniciando download")
+            logger.info("Conversão concluída, iniciando download")
             
             # Clica no download
             download_btn.click()
             
             # Aguarda download completar
             filename = self._wait_for_download()
-            print(f"[INFO] Download concluído: {filename}")
+            logger.info("Download concluído: %s", filename)
             return filename
                 
         except Exception as e:
-            print(f"Erro na conversão: {e}")
+            logger.error("Erro na conversão: %s", e)
             # Salva screenshot para debug
             try:
-                self.driver.save_screenshot(f"{self.download_dir}/error_screenshot.png")
-                print(f"[DEBUG] Screenshot salvo em {self.download_dir}/error_screenshot.png")
+                screenshot_path = OUTPUT_DIR / "error_screenshot.png"
+                self.driver.save_screenshot(str(screenshot_path))
+                logger.info("Screenshot salvo em %s", screenshot_path)
             except:
                 pass
             return None
-            
-        finally:
-            if self.driver:
-                time.sleep(2)
-                self.driver.quit()
+
+
+# ============ Cliente da API oficial ============
+class ILovePDFAPIClient:
+    """
+    Converte PDF para Word pela API REST oficial do iLovePDF.
+    
+    Alternativa ao ILovePDFConverter que dispensa o navegador: a conversão
+    vira algumas chamadas HTTP assíncronas (start, upload, process, download).
+    """
+    
+    # O token JWT da API expira em 2 horas; renova com folga
+    TOKEN_TTL = 60 * 60
+    
+    def __init__(self, public_key: str):
+        import httpx
+        
+        self.public_key = public_key
+        self.client = httpx.AsyncClient(base_url=ILOVEPDF_API_URL, timeout=120)
+        self._token: Optional[str] = None
+        self._token_expires = 0.0
+    
+    async def _headers(self) -> dict:
+        """Retorna o cabeçalho de autenticação, obtendo um novo token se preciso."""
+        if self._token is None or time.time() >= self._token_expires:
+            response = await self.client.post("/v1/auth", json={"public_key": self.public_key})
+            response.raise_for_status()
+            self._token = response.json()["token"]
+            self._token_expires = time.time() + self.TOKEN_TTL
+        return {"Authorization": f"Bearer {self._token}"}
+    
+    @staticmethod
+    async def _multipart_body(pdf_path: str, preamble: bytes, epilogue: bytes):
+        """Gera o corpo multipart do upload, lendo o PDF em blocos em uma thread."""
+        yield preamble
+        async with await anyio.open_file(pdf_path, "rb") as f:
+            while chunk := await f.read(UPLOAD_CHUNK_SIZE):
+                yield chunk
+        yield epilogue
+    
+    async def convert(self, pdf_path: str, dest_path: Path):
+        """Converte o PDF e grava o .docx resultante em dest_path."""
+        headers = await self._headers()
+        
+        # Cria a tarefa; a API indica o servidor que vai processá-la
+        response = await self.client.get(f"/v1/start/{ILOVEPDF_API_TOOL}", headers=headers)
+        response.raise_for_status()
+        start = response.json()
+        server_url = f"https://{start['server']}"
+        task = start["task"]
+        logger.info("Tarefa %s criada em %s", task, start["server"])
+        
+        # Upload do arquivo (multipart montado à mão para ler o PDF sem bloquear o loop)
+        filename = os.path.basename(pdf_path)
+        boundary = uuid.uuid4().hex
+        preamble = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="task"\r\n\r\n{task}\r\n'
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            f"Content-Type: application/pdf\r\n\r\n"
+        ).encode()
+        epilogue = f"\r\n--{boundary}--\r\n".encode()
+        size = (await anyio.Path(pdf_path).stat()).st_size
+        
+        response = await self.client.post(
+            f"{server_url}/v1/upload",
+            headers={
+                **headers,
+                "Content-Type": f"multipart/form-data; boundary={boundary}",
+                "Content-Length": str(len(preamble) + size + len(epilogue))
+            },
+            content=self._multipart_body(pdf_path, preamble, epilogue)
+        )
+        response.raise_for_status()
+        server_filename = response.json()["server_filename"]
+        logger.info("Arquivo enviado")
+        
+        # Processa a conversão
+        response = await self.client.post(
+            f"{server_url}/v1/process",
+            headers=headers,
+            json={
+                "task": task,
+                "tool": ILOVEPDF_API_TOOL,
+                "files": [{"server_filename": server_filename, "filename": filename}]
+            }
+        )
+        response.raise_for_status()
+        logger.info("Conversão concluída, iniciando download")
+        
+        # Baixa o resultado em blocos, direto para o disco
+        async with self.client.stream(
+            "GET", f"{server_url}/v1/download/{task}", headers=headers
+        ) as response:
+            response.raise_for_status()
+            async with await anyio.open_file(dest_path, "wb") as f:
+                async for chunk in response.aiter_bytes(UPLOAD_CHUNK_SIZE):
+                    await f.write(chunk)
+        logger.info("Download concluído: %s", dest_path.name)
+    
+    async def aclose(self):
+        """Fecha as conexões HTTP abertas."""
+        await self.client.aclose()
+
+
+api_client: Optional[ILovePDFAPIClient] = None
+
+# Referências às tarefas asyncio em andamento (evita que sejam coletadas)
+api_tasks: set = set()
 
 
 # ============ Funções de Background ============
+def run_conversion(pdf_path: str) -> Optional[str]:
+    """Converte o PDF usando um navegador do pool e move o .docx para OUTPUT_DIR."""
+    # Diretório de download exclusivo, para não disputar arquivos com outras conversões
+    job_name = Path(pdf_path).stem
+    job_dir = OUTPUT_DIR.absolute() / job_name
+    job_dir.mkdir(exist_ok=True)
+    
+    try:
+        driver = driver_pool.acquire()
+        try:
+            converter = ILovePDFConverter(driver=driver, download_dir=str(job_dir))
+            downloaded = converter.convert(pdf_path)
+        finally:
+            # Devolve o navegador ao pool
+            driver_pool.release(driver)
+        
+        if not downloaded:
+            return None
+        
+        filename = f"{job_name}.docx"
+        os.replace(job_dir / downloaded, OUTPUT_DIR / filename)
+        return filename
+    finally:
+        shutil.rmtree(job_dir, ignore_errors=True)
+
+
+def split_pdf(pdf_path: str, parts: int) -> List[str]:
+    """Divide o PDF em partes com número de páginas semelhante."""
+    reader = PdfReader(pdf_path)
+    total = len(reader.pages)
+    pages_per_part = -(-total // parts)
+    base = pdf_path[:-len(".pdf")]
+    
+    chunk_paths = []
+    for start in range(0, total, pages_per_part):
+        writer = PdfWriter()
+        for page in reader.pages[start:start + pages_per_part]:
+            writer.add_page(page)
+        chunk_path = f"{base}_parte{len(chunk_paths) + 1}.pdf"
+        with open(chunk_path, "wb") as f:
+            writer.write(f)
+        chunk_paths.append(chunk_path)
+    return chunk_paths
+
+
+def merge_docx(docx_paths: List[Path], dest_path: Path):
+    """Junta os arquivos .docx, na ordem, em um único documento."""
+    composer = Composer(Document(str(docx_paths[0])))
+    for path in docx_paths[1:]:
+        composer.append(Document(str(path)))
+    composer.save(str(dest_path))
+
+
+def run_split_conversion(
+    conversion_id: str, chunk_paths: List[str], chunk_docx: dict
+) -> Optional[str]:
+    """
+    Converte as partes do PDF em paralelo, uma por navegador, e junta o resultado.
+    
+    chunk_docx (índice da parte -> .docx convertido) é preservado entre as
+    tentativas: cada nova tentativa converte apenas as partes que falharam.
+    """
+    pending = [i for i in range(len(chunk_paths)) if i not in chunk_docx]
+    
+    def convert_part(index: int) -> Optional[str]:
+        try:
+            return run_conversion(chunk_paths[index])
+        except Exception as e:
+            logger.error("Erro na conversão da parte %d: %s", index + 1, e)
+            return None
+    
+    if pending:
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            for index, name in zip(pending, executor.map(convert_part, pending)):
+                if name:
+                    chunk_docx[index] = OUTPUT_DIR / name
+    
+    if len(chunk_docx) != len(chunk_paths):
+        return None
+    
+    filename = f"{conversion_id}.docx"
+    merge_docx([chunk_docx[i] for i in range(len(chunk_paths))], OUTPUT_DIR / filename)
+    return filename
+
+
+def should_split(pdf_path: str) -> bool:
+    """Indica se o PDF é grande o suficiente para ser convertido em partes."""
+    if PdfReader is None or MAX_CONCURRENT_CONVERSIONS < 2:
+        return False
+    
+    # PDF ilegível para o pypdf (corrompido, protegido...): converte inteiro
+    try:
+        return len(PdfReader(pdf_path).pages) > SPLIT_THRESHOLD_PAGES
+    except Exception as e:
+        logger.warning("Não foi possível contar as páginas, convertendo sem dividir: %s", e)
+        return False
+
+
+def complete_conversion(conversion_id: str, filename: str):
+    """Marca a conversão como concluída e registra ETag e cache do resultado."""
+    # O hash vem antes: o status só muda quando tudo para o download está pronto
+    etag = file_digest(OUTPUT_DIR / filename)
+    conversions[conversion_id]["filename"] = filename
+    conversions[conversion_id]["url"] = f"/download/{conversion_id}"
+    conversions[conversion_id]["etag"] = etag
+    conversions[conversion_id]["message"] = "Conversão concluída!"
+    conversions[conversion_id]["status"] = "completed"
+    cache_conversion(conversions[conversion_id]["digest"], conversion_id)
+
+
 def process_conversion(conversion_id: str, pdf_path: str):
     """Processa a conversão em background."""
+    chunk_paths: List[str] = []
+    chunk_docx: dict = {}
     try:
         # Atualiza status para processing
         conversions[conversion_id]["status"] = "processing"
         conversions[conversion_id]["message"] = "Convertendo PDF para Word..."
         
-        # Configura diretório de saída
-        output_dir = str(OUTPUT_DIR.absolute())
+        # PDFs grandes são divididos e convertidos em paralelo; as partes já
+        # convertidas são mantidas entre as tentativas
+        split = should_split(pdf_path)
         
-        # Executa conversão
-        converter = ILovePDFConverter(download_dir=output_dir)
-        filename = converter.convert(pdf_path)
+        # Executa conversão, tentando novamente em caso de falha
+        filename = None
+        for attempt in range(1, MAX_CONVERSION_ATTEMPTS + 1):
+            if attempt > 1:
+                conversions[conversion_id]["message"] = (
+                    f"Convertendo PDF para Word (tentativa {attempt} de {MAX_CONVERSION_ATTEMPTS})..."
+                )
+            try:
+                if split:
+                    if not chunk_paths:
+                        chunk_paths = split_pdf(pdf_path, MAX_CONCURRENT_CONVERSIONS)
+                    filename = run_split_conversion(conversion_id, chunk_paths, chunk_docx)
+                else:
+                    filename = run_conversion(pdf_path)
+            except Exception as e:
+                logger.error("Erro na conversão: %s", e)
+                if attempt == MAX_CONVERSION_ATTEMPTS:
+                    raise
+                continue
+            if filename:
+                break
         
         if filename:
             # Sucesso
-            conversions[conversion_id]["status"] = "completed"
-            conversions[conversion_id]["message"] = "Conversão concluída!"
-            conversions[conversion_id]["filename"] = filename
-            conversions[conversion_id]["url"] = f"/download/{conversion_id}"
+            complete_conversion(conversion_id, filename)
         else:
             # Erro
             conversions[conversion_id]["status"] = "error"
@@ -252,11 +832,215 @@ def process_conversion(conversion_id: str, pdf_path: str):
         conversions[conversion_id]["message"] = str(e)
     
     finally:
-        # Remove o PDF original após processamento
+        # Remove o PDF original e as partes temporárias após processamento
+        for path in [pdf_path, *chunk_paths, *chunk_docx.values()]:
+            try:
+                os.remove(path)
+            except:
+                pass
+
+
+async def process_conversion_api(conversion_id: str, pdf_path: str):
+    """Processa a conversão em background usando a API REST do iLovePDF."""
+    filename = f"{conversion_id}.docx"
+    completed = False
+    try:
+        # Atualiza status para processing
+        conversions[conversion_id]["status"] = "processing"
+        conversions[conversion_id]["message"] = "Convertendo PDF para Word..."
+        
+        # Executa conversão, tentando novamente em caso de falha
+        for attempt in range(1, MAX_CONVERSION_ATTEMPTS + 1):
+            if attempt > 1:
+                conversions[conversion_id]["message"] = (
+                    f"Convertendo PDF para Word (tentativa {attempt} de {MAX_CONVERSION_ATTEMPTS})..."
+                )
+            try:
+                await api_client.convert(pdf_path, OUTPUT_DIR / filename)
+                break
+            except Exception as e:
+                logger.error("Erro na conversão: %s", e)
+                if attempt == MAX_CONVERSION_ATTEMPTS:
+                    raise
+        
+        # Sucesso (o hash do arquivo é calculado fora do event loop)
+        await run_in_threadpool(complete_conversion, conversion_id, filename)
+        completed = True
+        
+    except Exception as e:
+        conversions[conversion_id]["status"] = "error"
+        conversions[conversion_id]["message"] = str(e)
+    
+    finally:
+        # Remove o PDF original e, se a conversão não terminou, o .docx parcial
+        paths = [pdf_path] if completed else [pdf_path, OUTPUT_DIR / filename]
+        for path in paths:
+            try:
+                await run_in_threadpool(os.remove, path)
+            except OSError:
+                pass
+
+
+def remove_conversion(conversion_id: str) -> bool:
+    """Remove uma conversão do registro e apaga o arquivo de saída."""
+    conv = conversions.pop(conversion_id, None)
+    if conv is None:
+        return False
+    
+    if conv.get("filename"):
         try:
-            os.remove(pdf_path)
+            os.remove(OUTPUT_DIR / conv["filename"])
         except:
             pass
+    return True
+
+
+def purge_expired_conversions():
+    """Remove conversões finalizadas há mais de CONVERSION_TTL segundos."""
+    # O lock do cache impede que uma conversão seja entregue como cache
+    # enquanto está sendo expirada
+    with conversion_cache_lock:
+        limit = time.time() - CONVERSION_TTL
+        # Copia os itens: novas conversões podem ser registradas pelo event loop
+        expired = [
+            conversion_id for conversion_id, conv in list(conversions.items())
+            if conv["status"] in ("completed", "error") and conv["created_at"] < limit
+        ]
+        for conversion_id in expired:
+            remove_conversion(conversion_id)
+
+
+def cache_conversion(digest: str, conversion_id: str):
+    """Registra o resultado de um PDF para reaproveitá-lo em envios repetidos."""
+    with conversion_cache_lock:
+        conversion_cache[digest] = conversion_id
+        conversion_cache.move_to_end(digest)
+        while len(conversion_cache) > CONVERSION_CACHE_SIZE:
+            conversion_cache.popitem(last=False)
+
+
+def reuse_cached_conversion(digest: str, original_filename: str) -> Optional[dict]:
+    """
+    Cria uma nova conversão, já concluída, a partir do resultado de um PDF idêntico.
+    
+    A nova conversão tem ID, nome original e prazo de expiração próprios, e
+    aponta para um hardlink (ou cópia) do arquivo existente: remover uma das
+    conversões não afeta a outra.
+    """
+    with conversion_cache_lock:
+        source_id = conversion_cache.get(digest)
+        if source_id is None:
+            return None
+        
+        source = conversions.get(source_id)
+        if source is None or source["status"] != "completed":
+            del conversion_cache[digest]
+            return None
+        
+        conversion_id = str(uuid.uuid4())
+        filename = f"{conversion_id}.docx"
+        source_path = OUTPUT_DIR / source["filename"]
+        try:
+            try:
+                os.link(source_path, OUTPUT_DIR / filename)
+            except OSError:
+                # Sistema de arquivos sem hardlinks: copia o arquivo
+                shutil.copyfile(source_path, OUTPUT_DIR / filename)
+        except FileNotFoundError:
+            # O resultado foi removido nesse meio tempo
+            del conversion_cache[digest]
+            return None
+        
+        # Renova o prazo da conversão de origem: o resultado voltou a ser usado
+        source["created_at"] = time.time()
+        conversion_cache.move_to_end(digest)
+        
+        conv = {
+            "id": conversion_id,
+            "status": "completed",
+            "message": "Conversão concluída!",
+            "url": f"/download/{conversion_id}",
+            "filename": filename,
+            "original_filename": original_filename,
+            "digest": digest,
+            "etag": source["etag"],
+            "created_at": time.time()
+        }
+        conversions[conversion_id] = conv
+        return conv
+
+
+def conversion_status(conv: dict) -> ConversionStatus:
+    """Monta a resposta de status a partir do registro da conversão."""
+    return ConversionStatus(
+        id=conv["id"],
+        status=conv["status"],
+        message=conv.get("message"),
+        url=conv.get("url"),
+        filename=conv.get("filename")
+    )
+
+
+def is_saturated() -> bool:
+    """Indica se já há conversões demais em andamento ou na fila."""
+    inflight = sum(
+        1 for conv in list(conversions.values())
+        if conv["status"] in ("pending", "processing")
+    )
+    if api_client:
+        return inflight >= MAX_CONCURRENT_API_CONVERSIONS
+    return inflight >= MAX_CONCURRENT_CONVERSIONS + MAX_QUEUED_CONVERSIONS
+
+
+def reject_busy():
+    """Recusa a requisição enquanto a API estiver saturada."""
+    raise HTTPException(
+        status_code=503,
+        detail="Servidor ocupado, tente novamente em instantes",
+        headers={"Retry-After": "30"}
+    )
+
+
+def stream_digest(source) -> str:
+    """Calcula o hash de um arquivo aberto, bloco a bloco."""
+    hasher = hashlib.blake2b(digest_size=16)
+    while chunk := source.read(UPLOAD_CHUNK_SIZE):
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def file_digest(path: Path) -> str:
+    """Calcula o hash de um arquivo em disco, bloco a bloco."""
+    with open(path, "rb") as f:
+        return stream_digest(f)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Compara If-None-Match com o ETag usando comparação fraca (RFC 9110).
+    
+    Proxies que comprimem a resposta reescrevem o ETag como W/"...", e o
+    cliente devolve essa forma; "*" casa com qualquer representação.
+    """
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def save_upload(source, dest_path: Path) -> str:
+    """Grava o arquivo enviado em disco, bloco a bloco, e retorna seu hash."""
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(dest_path, "wb") as f:
+        while chunk := source.read(UPLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+            f.write(chunk)
+    return hasher.hexdigest()
 
 
 # ============ Endpoints ============
@@ -279,12 +1063,24 @@ async def convert_pdf(file: UploadFile = File(...)):
     """
     Envia um arquivo PDF para conversão.
     
-    Retorna um ID para acompanhar o status.
+    Retorna um ID para acompanhar o status, ou 503 se a fila estiver cheia.
     """
     # Valida o arquivo
     if not file.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=400, detail="O arquivo deve ser um PDF")
     
+    # Aproveita a requisição para descartar conversões antigas (fora do event loop)
+    await run_in_threadpool(purge_expired_conversions)
+    
+    # Falha rápido se não houver capacidade, sem gravar o upload em disco;
+    # PDFs já convertidos ainda são atendidos pelo cache
+    if is_saturated():
+        digest = await run_in_threadpool(stream_digest, file.file)
+        cached = await run_in_threadpool(reuse_cached_conversion, digest, file.filename)
+        if not cached:
+            reject_busy()
+        return conversion_status(cached)
+    
     # Gera ID único
     conversion_id = str(uuid.uuid4())
     
@@ -292,12 +1088,22 @@ async def convert_pdf(file: UploadFile = File(...)):
     pdf_path = UPLOAD_DIR / f"{conversion_id}.pdf"
     
     try:
-        content = await file.read()
-        with open(pdf_path, "wb") as f:
-            f.write(content)
+        # Copia em blocos, fora do event loop, sem carregar o PDF inteiro na memória
+        digest = await run_in_threadpool(save_upload, file.file, pdf_path)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao salvar arquivo: {e}")
     
+    # PDF idêntico já convertido: devolve o resultado existente
+    cached = await run_in_threadpool(reuse_cached_conversion, digest, file.filename)
+    if cached:
+        await run_in_threadpool(os.remove, pdf_path)
+        return conversion_status(cached)
+    
+    # Confere de novo: outras requisições podem ter entrado durante o upload
+    if is_saturated():
+        await run_in_threadpool(os.remove, pdf_path)
+        reject_busy()
+    
     # Inicializa o status
     conversions[conversion_id] = {
         "id": conversion_id,
@@ -305,15 +1111,21 @@ async def convert_pdf(file: UploadFile = File(...)):
         "message": "Aguardando processamento...",
         "url": None,
         "filename": None,
-        "original_filename": file.filename
+        "original_filename": file.filename,
+        "digest": digest,
+        "created_at": time.time()
     }
     
-    # Inicia conversão em background
-    thread = threading.Thread(
-        target=process_conversion,
-        args=(conversion_id, str(pdf_path.absolute()))
-    )
-    thread.start()
+    if api_client:
+        # API REST: a conversão roda como tarefa assíncrona no próprio event loop
+        task = asyncio.create_task(
+            process_conversion_api(conversion_id, str(pdf_path.absolute()))
+        )
+        api_tasks.add(task)
+        task.add_done_callback(api_tasks.discard)
+    else:
+        # Enfileira a conversão; no máximo MAX_CONCURRENT_CONVERSIONS rodam ao mesmo tempo
+        conversion_executor.submit(process_conversion, conversion_id, str(pdf_path.absolute()))
     
     return ConversionStatus(
         id=conversion_id,
@@ -333,30 +1145,26 @@ async def get_status(conversion_id: str):
     - completed: Concluído (url disponível)
     - error: Erro na conversão
     """
-    if conversion_id not in conversions:
+    conv = conversions.get(conversion_id)
+    if conv is None:
         raise HTTPException(status_code=404, detail="Conversão não encontrada")
     
-    conv = conversions[conversion_id]
-    
-    return ConversionStatus(
-        id=conv["id"],
-        status=conv["status"],
-        message=conv.get("message"),
-        url=conv.get("url"),
-        filename=conv.get("filename")
-    )
+    return conversion_status(conv)
 
 
 @app.get("/download/{conversion_id}")
-async def download_file(conversion_id: str):
+def download_file(conversion_id: str, request: Request):
     """
     Baixa o arquivo Word convertido.
+    
+    Endpoint síncrono: o FastAPI o executa no threadpool, mantendo o acesso
+    ao disco fora do event loop. Responde 304 quando o cliente já tem a
+    versão atual (If-None-Match).
     """
-    if conversion_id not in conversions:
+    conv = conversions.get(conversion_id)
+    if conv is None:
         raise HTTPException(status_code=404, detail="Conversão não encontrada")
     
-    conv = conversions[conversion_id]
-    
     if conv["status"] != "completed":
         raise HTTPException(
             status_code=400, 
@@ -367,9 +1175,20 @@ async def download_file(conversion_id: str):
     if not filename:
         raise HTTPException(status_code=404, detail="Arquivo não encontrado")
     
+    # ETag calculado uma única vez, ao concluir a conversão
+    headers = {"Cache-Control": f"private, max-age={DOWNLOAD_MAX_AGE}"}
+    etag = conv.get("etag")
+    if etag:
+        headers["ETag"] = f'"{etag}"'
+        if etag_matches(request.headers.get("if-none-match", ""), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+    
     file_path = OUTPUT_DIR / filename
     
-    if not file_path.exists():
+    # Um único stat, reaproveitado pelo FileResponse
+    try:
+        stat_result = os.stat(file_path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Arquivo não encontrado no servidor")
     
     # Nome original sem .pdf + .docx
@@ -379,34 +1198,26 @@ async def download_file(conversion_id: str):
     return FileResponse(
         path=str(file_path),
         filename=download_name,
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        headers=headers,
+        stat_result=stat_result
     )
 
 
 @app.get("/conversions")
-async def list_conversions():
-    """Lista todas as conversões (para debug)."""
+def list_conversions():
+    """Lista todas as conversões (para debug). Síncrono: roda no threadpool."""
+    purge_expired_conversions()
     return {"conversions": list(conversions.values())}
 
 
 @app.delete("/conversion/{conversion_id}")
-async def delete_conversion(conversion_id: str):
-    """Remove uma conversão e seus arquivos."""
-    if conversion_id not in conversions:
+def delete_conversion(conversion_id: str):
+    """Remove uma conversão e seus arquivos. Síncrono: roda no threadpool."""
+    # Remove do registro e apaga o arquivo de saída
+    if not remove_conversion(conversion_id):
         raise HTTPException(status_code=404, detail="Conversão não encontrada")
     
-    conv = conversions[conversion_id]
-    
-    # Remove arquivo de saída
-    if conv.get("filename"):
-        try:
-            os.remove(OUTPUT_DIR / conv["filename"])
-        except:
-            pass
-    
-    # Remove do registro
-    del conversions[conversion_id]
-    
     return {"message": "Conversão removida"}
 
 